@@ -8,6 +8,27 @@ Role: Finds the best matches using scoring algorithm
 from tools.data_loader import DataLoader
 from tools.compatibility_scorer import CompatibilityScorer
 import json
+import logging
+from datetime import datetime
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+
+def _classify(score: int) -> str:
+    """Recommendation text for a score"""
+    if score >= 80:
+        return "STRONG MATCH - Highly recommended"
+    elif score >= 60:
+        return "GOOD MATCH - Recommended with notes"
+    elif score >= 40:
+        return "POSSIBLE MATCH - Requires careful consideration"
+    else:
+        return "NOT RECOMMENDED - Compatibility concerns"
+
+# Recommendation for every possible score (0-100), indexed by score
+_RECOMMENDATION_TABLE = tuple(_classify(score) for score in range(101))
 
 class MatchingAgent:
     """
@@ -15,71 +36,123 @@ class MatchingAgent:
     Think of this as the "matching counselor" who knows what works.
     """
     
-    def __init__(self, data_loader: DataLoader):
-        """Initialize with data loader and scorer"""
+    def __init__(self, data_loader: DataLoader, verbose: bool = False):
+        """
+        Initialize with data loader and scorer
+        
+        Args:
+            data_loader: Loaded shelter data
+            verbose: Print progress while matching (default False)
+        """
         self.data_loader = data_loader
         self.scorer = CompatibilityScorer()
-        print("✓ Matching Agent initialized")
+        self.verbose = verbose
+        
+        # Score and rank-key buffers reused by every find_matches call (the
+        # catalog does not change for the life of the loader). argpartition
+        # still allocates its own index array of size N per call.
+        n = len(data_loader.animals)
+        self._scores_buf = np.empty(n, dtype=np.int64)
+        self._keys_buf = np.empty(n, dtype=np.int64)
+        self._tie_break = np.arange(n - 1, -1, -1, dtype=np.int64)
+        log.info("✓ Matching Agent initialized")
     
-    def find_matches(self, adopter_id: str, top_n: int = 3) -> list:
+    def find_matches(self, adopter_id: str, top_n: int = 3,
+                     verbose: bool = None,
+                     adopter_profile: dict = None) -> list:
         """
         Find best animals for a specific adopter
         
         Args:
             adopter_id: ID of adopter (e.g., '1')
             top_n: Number of top matches to return (default 3)
+            verbose: Print progress; defaults to the agent's setting
+            adopter_profile: Profile already built by the ProfilingAgent
+                for this adopter; its raw_data row is used instead of
+                looking the adopter up again
         
         Returns:
             List of matches sorted by score (highest first)
         """
-        print(f"\n[MATCHING AGENT] Finding matches for adopter {adopter_id}...")
-        
-        adopter = self.data_loader.get_adopter(adopter_id)
+        verbose = self.verbose if verbose is None else verbose
+        if verbose:
+            print(f"\n[MATCHING AGENT] Finding matches for adopter {adopter_id}...")
+        
+        if adopter_profile is not None:
+            adopter = adopter_profile['raw_data']
+            if adopter.get('adopter_id') != adopter_id:
+                print(f"ERROR: Profile is for adopter {adopter.get('adopter_id')}, not {adopter_id}")
+                return []
+        else:
+            adopter = self.data_loader.get_adopter(adopter_id)
         if not adopter:
             print(f"ERROR: Adopter {adopter_id} not found")
             return []
         
-        matches = []
-        
-        # Score adopter against ALL animals
-        for animal in self.data_loader.get_all_animals():
-            # Calculate compatibility score
+        animals = self.data_loader.animals
+        
+        # Score adopter against ALL animals in one vectorized pass. No
+        # per-animal upper-bound pruning: the branchless pass costs less
+        # than testing a bound would, and the expensive part (reasoning
+        # text) is already limited to the top N below.
+        scores = self.scorer.score_all(
+            self.data_loader.animal_matrix, adopter, out=self._scores_buf)
+        
+        # Rank on score, breaking ties by catalog order (earlier wins)
+        n = len(animals)
+        keys = np.multiply(scores, n, out=self._keys_buf)
+        keys += self._tie_break
+        k = max(min(top_n, n), 0)
+        if 0 < k < n:
+            best = np.argpartition(keys, -k)[-k:]
+        else:
+            best = np.arange(n)[:k]
+        best = best[np.argsort(keys[best])[::-1]]
+        
+        # Only the top N need the full scalar pass for reasoning text.
+        # They all share a single timestamp for this search.
+        timestamp = datetime.now().isoformat()
+        top_matches = []
+        for index in best:
+            animal = animals[index]
             score, reasoning = self.scorer.calculate_compatibility(animal, adopter)
-            
-            match = {
+            top_matches.append({
                 'animal_id': animal['animal_id'],
                 'animal_name': animal['name'],
+                'animal_breed': animal['breed'],
                 'adopter_id': adopter['adopter_id'],
                 'adopter_name': adopter['name'],
                 'score': score,
-                'reasoning': reasoning
-            }
-            matches.append(match)
-        
-        # Sort by score (highest first)
-        matches.sort(key=lambda x: x['score'], reverse=True)
-        
-        # Return top N matches
-        top_matches = matches[:top_n]
-        
-        print(f"✓ Found {len(top_matches)} matches")
-        for i, match in enumerate(top_matches, 1):
-            print(f"  {i}. {match['animal_name']} - Score: {match['score']}/100")
+                'reasoning': reasoning,
+                'timestamp': timestamp
+            })
+        
+        if verbose:
+            lines = [f"✓ Found {len(top_matches)} matches"]
+            lines.extend(
+                f"  {i}. {match['animal_name']} - Score: {match['score']}/100"
+                for i, match in enumerate(top_matches, 1)
+            )
+            print("\n".join(lines))
         
         return top_matches
     
-    def get_detailed_match(self, animal_id: str, adopter_id: str) -> dict:
+    def get_detailed_match(self, animal_id: str, adopter_id: str,
+                           verbose: bool = None) -> dict:
         """
         Get detailed analysis of a specific animal-adopter match
         
         Args:
             animal_id: ID of animal
             adopter_id: ID of adopter
+            verbose: Print progress; defaults to the agent's setting
         
         Returns:
             Dictionary with detailed match information
         """
-        print(f"\n[MATCHING AGENT] Detailed analysis: Animal {animal_id} ↔ Adopter {adopter_id}")
+        verbose = self.verbose if verbose is None else verbose
+        if verbose:
+            print(f"\n[MATCHING AGENT] Detailed analysis: Animal {animal_id} ↔ Adopter {adopter_id}")
         
         animal = self.data_loader.get_animal(animal_id)
         adopter = self.data_loader.get_adopter(adopter_id)
@@ -103,21 +176,15 @@ class MatchingAgent:
             'adopter_data': adopter
         }
         
-        print(f"✓ Score: {score}/100")
-        print(f"✓ Recommendation: {analysis['recommendation']}")
+        if verbose:
+            print(f"✓ Score: {score}/100")
+            print(f"✓ Recommendation: {analysis['recommendation']}")
         
         return analysis
     
     def _get_recommendation(self, score: int) -> str:
         """Convert score to recommendation text"""
-        if score >= 80:
-            return "STRONG MATCH - Highly recommended"
-        elif score >= 60:
-            return "GOOD MATCH - Recommended with notes"
-        elif score >= 40:
-            return "POSSIBLE MATCH - Requires careful consideration"
-        else:
-            return "NOT RECOMMENDED - Compatibility concerns"
+        return _RECOMMENDATION_TABLE[min(max(score, 0), 100)]
 
 # Test the agent
 if __name__ == "__main__":
@@ -128,7 +195,7 @@ if __name__ == "__main__":
     print("="*60)
     
     loader = DataLoader('animal_data.csv', 'adopter_data.csv')
-    matcher = MatchingAgent(loader)
+    matcher = MatchingAgent(loader, verbose=True)
     
     # Find matches for adopter 1
     matches = matcher.find_matches('1', top_n=3)
@@ -5,8 +5,6 @@ Purpose: Understand and structure information about animals and adopters
 Role: Extracts key traits, creates profiles, prepares data for matching
 """
 
-import sys
-sys.path.insert(0, '.')
 from tools.data_loader import DataLoader
 
 import json
@@ -34,35 +32,11 @@ class ProfilingAgent:
         """
         print(f"\n[PROFILING AGENT] Analyzing animal {animal_id}...")
         
-        animal = self.data_loader.get_animal(animal_id)
-        if not animal:
+        # Profiles are parsed once by the DataLoader; this is a lookup
+        profile = self.data_loader.get_animal_profile(animal_id)
+        if not profile:
             return {"error": f"Animal {animal_id} not found"}
         
-        # Extract and structure key information
-        profile = {
-            "type": "animal",
-            "id": animal_id,
-            "name": animal.get('name'),
-            "species": animal.get('species'),
-            "breed": animal.get('breed'),
-            "age_years": int(animal.get('age_years', 0)),
-            "energy_level": animal.get('energy_level'),
-            "good_with_kids": animal.get('good_with_kids').lower() == 'yes',
-            "good_with_dogs": animal.get('good_with_dogs').lower() == 'yes',
-            "special_needs": animal.get('special_needs').lower() == 'yes',
-            "behavioral_traits": animal.get('behavioral_traits').split(';'),
-            "raw_data": animal
-        }
-        
-        # Create summary
-        traits_text = ', '.join(profile['behavioral_traits'])
-        profile['summary'] = (
-            f"{profile['name']}, a {profile['age_years']}-year-old {profile['breed']} "
-            f"with {profile['energy_level']} energy. Traits: {traits_text}. "
-            f"Good with kids: {profile['good_with_kids']}, "
-            f"Good with dogs: {profile['good_with_dogs']}"
-        )
-        
         print(f"✓ Profile created: {profile['summary']}")
         return profile
     
@@ -78,33 +52,11 @@ class ProfilingAgent:
         """
         print(f"\n[PROFILING AGENT] Analyzing adopter {adopter_id}...")
         
-        adopter = self.data_loader.get_adopter(adopter_id)
-        if not adopter:
+        # Profiles are parsed once by the DataLoader; this is a lookup
+        profile = self.data_loader.get_adopter_profile(adopter_id)
+        if not profile:
             return {"error": f"Adopter {adopter_id} not found"}
         
-        # Extract and structure key information
-        profile = {
-            "type": "adopter",
-            "id": adopter_id,
-            "name": adopter.get('name'),
-            "home_type": adopter.get('home_type'),
-            "has_kids": adopter.get('has_kids').lower() == 'yes',
-            "has_other_pets": adopter.get('has_other_pets').lower() == 'yes',
-            "lifestyle": adopter.get('lifestyle'),
-            "commitment_level": adopter.get('commitment_level'),
-            "experience_level": adopter.get('experience_level'),
-            "preferences": adopter.get('preferences').split(';'),
-            "raw_data": adopter
-        }
-        
-        # Create summary
-        profile['summary'] = (
-            f"{profile['name']}, living in a {profile['home_type']} "
-            f"with {profile['lifestyle']} lifestyle. "
-            f"Experience: {profile['experience_level']}, "
-            f"Commitment: {profile['commitment_level']}"
-        )
-        
         print(f"✓ Profile created: {profile['summary']}")
         return profile
     
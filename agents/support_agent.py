@@ -5,6 +5,69 @@ Purpose: Provide post-adoption guidance and support
 Role: Helps families adjust to their new pets
 """
 
+import re
+
+# Concern keywords, grouped by the response they trigger
+_CONCERN_KEYWORDS = {
+    'behavior': ('aggressive', 'behavior'),
+    'anxiety': ('scared', 'afraid', 'anxious'),
+    'training': ('training', 'obedience'),
+    'health': ('health', 'sick'),
+}
+
+# Checked in this order when a concern mentions more than one category
+_CONCERN_CATEGORIES = tuple(_CONCERN_KEYWORDS)
+
+_KEYWORD_CATEGORY = {
+    keyword: category
+    for category, keywords in _CONCERN_KEYWORDS.items()
+    for keyword in keywords
+}
+
+_CONCERN_KEYWORDS_RE = re.compile('|'.join(_KEYWORD_CATEGORY))
+
+_CONCERN_RESPONSES = {
+    'behavior': """
+BEHAVIORAL CONCERNS:
+{name} may need time to feel secure. Consider:
+- Working with a professional trainer
+- Using positive reinforcement techniques
+- Consulting your veterinarian for any medical causes
+- Patience - behavioral change takes weeks/months
+""",
+    'anxiety': """
+ANXIETY/FEAR CONCERNS:
+{name} may have had a difficult past. Tips:
+- Create a safe, quiet space initially
+- Gradually introduce to new environments
+- Use calming techniques (music, pheromone products)
+- Let them set the pace for interaction
+- Consider anxiety medication if severe
+""",
+    'training': """
+TRAINING TIPS:
+- Start with basic commands (sit, stay, come)
+- Use positive reinforcement (treats, praise)
+- Keep sessions short (5-10 minutes)
+- Be consistent with commands
+- Consider professional training if needed
+""",
+    'health': """
+HEALTH CONCERNS:
+- Schedule a vet checkup within first week
+- Keep vaccination records up to date
+- Monitor for signs of illness
+- Report any health issues immediately to veterinarian
+- Ask about pet insurance for ongoing care
+""",
+}
+
+_GENERAL_RESPONSE = """
+GENERAL SUPPORT:
+The shelter and veterinarian are your best resources.
+{name} needs time to adjust. Be patient and celebrate progress!
+"""
+
 class SupportAgent:
     """
     Agent responsible for providing post-adoption guidance and support.
@@ -79,55 +142,13 @@ Remember: Every adoption is unique. Be patient and celebrate small wins!
     def _respond_to_concern(self, animal_name: str, concern: str) -> str:
         """Provide tailored response to specific adopter concern"""
         
-        concern_lower = concern.lower()
-        
-        if 'aggressive' in concern_lower or 'behavior' in concern_lower:
-            return f"""
-BEHAVIORAL CONCERNS:
-{animal_name} may need time to feel secure. Consider:
-- Working with a professional trainer
-- Using positive reinforcement techniques
-- Consulting your veterinarian for any medical causes
-- Patience - behavioral change takes weeks/months
-"""
-        
-        elif 'scared' in concern_lower or 'afraid' in concern_lower or 'anxious' in concern_lower:
-            return f"""
-ANXIETY/FEAR CONCERNS:
-{animal_name} may have had a difficult past. Tips:
-- Create a safe, quiet space initially
-- Gradually introduce to new environments
-- Use calming techniques (music, pheromone products)
-- Let them set the pace for interaction
-- Consider anxiety medication if severe
-"""
-        
-        elif 'training' in concern_lower or 'obedience' in concern_lower:
-            return f"""
-TRAINING TIPS:
-- Start with basic commands (sit, stay, come)
-- Use positive reinforcement (treats, praise)
-- Keep sessions short (5-10 minutes)
-- Be consistent with commands
-- Consider professional training if needed
-"""
-        
-        elif 'health' in concern_lower or 'sick' in concern_lower:
-            return f"""
-HEALTH CONCERNS:
-- Schedule a vet checkup within first week
-- Keep vaccination records up to date
-- Monitor for signs of illness
-- Report any health issues immediately to veterinarian
-- Ask about pet insurance for ongoing care
-"""
-        
-        else:
-            return f"""
-GENERAL SUPPORT:
-The shelter and veterinarian are your best resources.
-{animal_name} needs time to adjust. Be patient and celebrate progress!
-"""
+        # One scan over the concern; if several categories are mentioned
+        # the earliest in _CONCERN_CATEGORIES wins
+        found = {_KEYWORD_CATEGORY[k] for k in _CONCERN_KEYWORDS_RE.findall(concern.lower())}
+        for category in _CONCERN_CATEGORIES:
+            if category in found:
+                return _CONCERN_RESPONSES[category].format(name=animal_name)
+        return _GENERAL_RESPONSE.format(name=animal_name)
     
     def get_training_tips(self, animal_species: str, breed: str, 
                          age_years: int, behavior: str) -> str:
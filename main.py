@@ -1,12 +1,12 @@
+import logging
 import os
-import json
 import uuid
 from dotenv import load_dotenv
 from tools.data_loader import DataLoader
 from agents.profiling_agent import ProfilingAgent
 from agents.matching_agent import MatchingAgent
 from agents.support_agent import SupportAgent
-from models.memory_store import MemoryStore
+from models.memory_store import MemoryStore, encode_json
 from models.adoption_session import AdoptionMatch
 
 # Load environment
@@ -18,13 +18,19 @@ class AdoptionMatchingSystem:
     This is the Think → Act → Observe loop.
     """
     
-    def __init__(self):
+    def __init__(self, verbose: bool = False):
+        """
+        Args:
+            verbose: Print per-agent progress while processing (default False)
+        """
+        self.verbose = verbose
+        
         # Initialize data
         self.data_loader = DataLoader('animal_data.csv', 'adopter_data.csv')
         
         # Initialize agents
         self.profiler = ProfilingAgent(self.data_loader)
-        self.matcher = MatchingAgent(self.data_loader)
+        self.matcher = MatchingAgent(self.data_loader, verbose=verbose)
         self.support = SupportAgent()
         
         # Initialize memory/sessions
@@ -51,18 +57,28 @@ class AdoptionMatchingSystem:
         print("[STEP 1: PROFILING AGENT]")
         print("Analyzing adopter profile...")
         adopter_profile = self.profiler.profile_adopter(adopter_id)
-        print(f"✓ Profile complete: {json.dumps(adopter_profile, indent=2)}\n")
+        if self.verbose:
+            profile_dump = encode_json(adopter_profile, indent=True).decode()
+            print(f"✓ Profile complete: {profile_dump}\n")
+        elif 'error' in adopter_profile:
+            print(f"⚠ Profile incomplete: {adopter_profile['error']}\n")
+        else:
+            print(f"✓ Profile complete: {adopter_profile.get('summary')}\n")
         
         # STEP 2: ACT - Find matches
         print("[STEP 2: MATCHING AGENT]")
         print("Finding compatible animals...")
-        matches = self.matcher.find_matches(adopter_id, top_n=3)
+        # Reuse the profile from STEP 1 rather than re-reading the adopter
+        matches = self.matcher.find_matches(
+            adopter_id, top_n=3,
+            adopter_profile=None if 'error' in adopter_profile else adopter_profile
+        )
         
-        print(f"Found {len(matches)} potential matches:\n")
+        lines = [f"Found {len(matches)} potential matches:\n"]
         for i, match in enumerate(matches, 1):
-            print(f"{i}. {match['adopter_name']} → {match['animal_name']}")
-            print(f"   Score: {match['score']}/100")
-            print(f"   {match['reasoning']}\n")
+            lines.append(f"{i}. {match['adopter_name']} → {match['animal_name']}")
+            lines.append(f"   Score: {match['score']}/100")
+            lines.append(f"   {match['reasoning']}\n")
             
             # Record in session (Memory: storing recommendations)
             adoption_match = AdoptionMatch(
@@ -71,28 +87,25 @@ class AdoptionMatchingSystem:
                 animal_name=match['animal_name'],
                 adopter_name=match['adopter_name'],
                 score=match['score'],
+                timestamp=match['timestamp'],
                 status='recommended'
             )
             session.add_match(adoption_match)
+        print("\n".join(lines))
         
         # STEP 3: OBSERVE & Provide guidance
         print("[STEP 3: SUPPORT AGENT]")
         if matches:
             best_match = matches[0]
-            animal = self.data_loader.get_animal(best_match['animal_id'])
-            adopter = self.data_loader.get_adopter(adopter_id)
             
             print(f"Providing post-adoption guidance for recommended match...")
             guidance = self.support.get_post_adoption_guidance(
-                animal_name=animal['name'],
-                animal_breed=animal['breed'],
-                adopter_name=adopter['name']
+                animal_name=best_match['animal_name'],
+                animal_breed=best_match['animal_breed'],
+                adopter_name=best_match['adopter_name']
             )
             print(f"Guidance:\n{guidance}\n")
         
-        # Save session (Memory: persisting session data)
-        self.memory.save_to_file()
-        
         return {
             'session_id': session_id,
             'adopter_id': adopter_id,
@@ -118,6 +131,9 @@ class AdoptionMatchingSystem:
             results.append(result)
             print("\n" + "-"*60)
         
+        # Save changed sessions in one pass (Memory: persisting session data)
+        self.memory.save_to_file()
+        
         # Summary
         print("\n" + "="*60)
         print("PROCESS SUMMARY")
@@ -130,7 +146,9 @@ class AdoptionMatchingSystem:
         return results
 
 if __name__ == "__main__":
+    # Show the one-time load banners; per-operation messages are DEBUG
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     system = AdoptionMatchingSystem()
     results = system.simulate_adoption_process()
     
-    print("\n✓ Simulation complete. Sessions saved to sessions.json")
+    print(f"\n✓ Simulation complete. Sessions saved to {system.memory.session_dir}/")
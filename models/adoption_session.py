@@ -9,8 +9,11 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Any
 import json
+import logging
 
-@dataclass
+log = logging.getLogger(__name__)
+
+@dataclass(slots=True)
 class AdoptionMatch:
     """Represents a single adoption match recommendation"""
     animal_id: str
@@ -18,7 +21,8 @@ class AdoptionMatch:
     animal_name: str
     adopter_name: str
     score: int
-    timestamp: datetime = field(default_factory=datetime.now)
+    # ISO-8601 string; callers creating many matches at once can share one
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
     status: str = "recommended"  # recommended, accepted, rejected, completed
     notes: str = ""
     
@@ -30,12 +34,35 @@ class AdoptionMatch:
             'animal_name': self.animal_name,
             'adopter_name': self.adopter_name,
             'score': self.score,
-            'timestamp': self.timestamp.isoformat(),
+            'timestamp': self.timestamp,
             'status': self.status,
             'notes': self.notes
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'AdoptionMatch':
+        """
+        Rebuild a match from its to_dict() form
+        
+        Skips __init__ and writes the slots directly. Optional fields
+        missing from older or partial records get their defaults; unknown
+        keys are ignored.
+        """
+        _get = data.get
+        _set = object.__setattr__
+        
+        obj = object.__new__(cls)
+        _set(obj, 'animal_id', data['animal_id'])
+        _set(obj, 'adopter_id', data['adopter_id'])
+        _set(obj, 'animal_name', data['animal_name'])
+        _set(obj, 'adopter_name', data['adopter_name'])
+        _set(obj, 'score', data['score'])
+        _set(obj, 'timestamp', _get('timestamp') or datetime.now().isoformat())
+        _set(obj, 'status', _get('status', 'recommended'))
+        _set(obj, 'notes', _get('notes', ''))
+        return obj
 
-@dataclass
+@dataclass(slots=True)
 class AdoptionSession:
     """
     Session for tracking adoption process.
@@ -55,29 +82,49 @@ class AdoptionSession:
     adoption_date: datetime = None
     feedback: str = ""
     session_state: Dict[str, Any] = field(default_factory=dict)
+    # Changed since last persisted; set by every mutator below. Leading
+    # underscore keeps it out of orjson's dataclass output (and to_dict).
+    _dirty: bool = field(default=True, init=False, repr=False, compare=False)
+    
+    @property
+    def dirty(self) -> bool:
+        """Whether the session changed since it was last saved"""
+        return self._dirty
+    
+    def mark_dirty(self):
+        """Flag a change made without the methods below (e.g. direct edits)"""
+        self._dirty = True
+    
+    def mark_saved(self):
+        """Clear the changed flag after the session has been persisted"""
+        self._dirty = False
     
     def add_match(self, match: AdoptionMatch):
         """Add a match recommendation to session history"""
         self.matches.append(match)
-        print(f"  ✓ Match recorded: {match.animal_name} for {match.adopter_name}")
+        self._dirty = True
+        log.debug("  ✓ Match recorded: %s for %s", match.animal_name, match.adopter_name)
     
     def select_animal(self, animal_id: str):
         """Record selected animal"""
         self.selected_animal = animal_id
         self.session_state['selection_time'] = datetime.now().isoformat()
-        print(f"  ✓ Animal {animal_id} selected")
+        self._dirty = True
+        log.debug("  ✓ Animal %s selected", animal_id)
     
     def complete_adoption(self):
         """Mark adoption as complete"""
         self.adoption_date = datetime.now()
         self.session_state['status'] = 'completed'
-        print(f"  ✓ Adoption marked as complete")
+        self._dirty = True
+        log.debug("  ✓ Adoption marked as complete")
     
     def add_feedback(self, feedback: str):
         """Add post-adoption feedback"""
         self.feedback = feedback
         self.session_state['feedback_time'] = datetime.now().isoformat()
-        print(f"  ✓ Feedback recorded")
+        self._dirty = True
+        log.debug("  ✓ Feedback recorded")
     
     def get_session_summary(self) -> str:
         """Get human-readable summary of session"""
@@ -106,9 +153,36 @@ Feedback: {self.feedback if self.feedback else 'No feedback yet'}
             'feedback': self.feedback,
             'session_state': self.session_state
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'AdoptionSession':
+        """
+        Rebuild a session from its to_dict() form
+        
+        Skips __init__ and the default factories, writing the slots
+        directly. The result is marked as saved.
+        """
+        _get = data.get
+        _set = object.__setattr__
+        match_from_dict = AdoptionMatch.from_dict
+        adoption_date = _get('adoption_date')
+        
+        obj = object.__new__(cls)
+        _set(obj, 'session_id', data['session_id'])
+        _set(obj, 'adopter_id', data['adopter_id'])
+        _set(obj, 'created_at', datetime.fromisoformat(data['created_at']))
+        _set(obj, 'matches', [match_from_dict(m) for m in _get('matches', ())])
+        _set(obj, 'selected_animal', _get('selected_animal'))
+        _set(obj, 'adoption_date',
+             datetime.fromisoformat(adoption_date) if adoption_date else None)
+        _set(obj, 'feedback', _get('feedback', ''))
+        _set(obj, 'session_state', _get('session_state', {}))
+        _set(obj, '_dirty', False)
+        return obj
 
 # Test
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format='%(message)s')
     print("Testing AdoptionSession...")
     
     session = AdoptionSession(
@@ -8,11 +8,174 @@ In production, this would be a database.
 For this prototype, we use JSON files for simplicity.
 """
 
+import base64
+import glob
 import json
+import logging
+import mmap
 import os
+import struct
+import weakref
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from models.adoption_session import AdoptionSession
+from tools.hyperloglog import DistinctCounter, HyperLogLog
+
+try:
+    import orjson
+except ImportError:  # fall back to the (slower) stdlib encoder
+    orjson = None
+
+log = logging.getLogger(__name__)
+
+# Binary record for the match history log: a fixed header followed by the
+# UTF-8 adopter_id, animal_id and animal_name, then any other keys as JSON.
+# Header: flags, the three string lengths (MATCH_ABSENT if the key is
+# missing or not a string), JSON length, integer score, timestamp (seconds
+# since the epoch; a double keeps microseconds)
+MATCH_HEADER = struct.Struct('<BHHHIqd')
+MATCH_ABSENT = 0xFFFF
+_MATCH_HAS_SCORE = 1
+_MATCH_STR_KEYS = ('adopter_id', 'animal_id', 'animal_name')
+# The log starts with the generation it belongs to. compact() bumps the
+# generation in the snapshot before resetting the log, so a log left
+# behind by a crash in between is recognized as already folded in.
+LOG_HEADER = struct.Struct('<Q')
+
+
+def _default(obj: Any) -> Any:
+    """Serialize anything the JSON encoder can't handle natively"""
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    to_dict = getattr(obj, 'to_dict', None)
+    return to_dict() if to_dict else str(obj)
+
+
+def encode_json(data: Any, indent: bool = False) -> bytes:
+    """Encode data as JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(data, default=_default, option=option)
+    return json.dumps(data, indent=2 if indent else None,
+                      default=_default).encode()
+
+
+def decode_json(raw: bytes) -> Any:
+    """Decode JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def pack_match(match: Dict, timestamp: datetime) -> bytes:
+    """
+    Encode a recorded match as one binary log record
+    
+    Lossless: string IDs and names are length-prefixed rather than
+    truncated, and every other key (or a non-string ID, non-integer
+    score) goes into the trailing JSON.
+    """
+    extras = {k: v for k, v in match.items()
+              if k not in _MATCH_STR_KEYS and k not in ('score', 'timestamp')}
+    strings = []
+    lengths = []
+    for key in _MATCH_STR_KEYS:
+        value = match.get(key)
+        encoded = value.encode() if isinstance(value, str) else None
+        if encoded is None or len(encoded) >= MATCH_ABSENT:
+            if key in match:
+                extras[key] = value
+            lengths.append(MATCH_ABSENT)
+        else:
+            strings.append(encoded)
+            lengths.append(len(encoded))
+    
+    score = match.get('score')
+    flags = 0
+    if type(score) is int and -2**63 <= score < 2**63:
+        flags |= _MATCH_HAS_SCORE
+    else:
+        if 'score' in match:
+            extras['score'] = score
+        score = 0
+    
+    extras_json = encode_json(extras) if extras else b''
+    header = MATCH_HEADER.pack(flags, *lengths, len(extras_json), score,
+                               timestamp.timestamp())
+    return b''.join((header, *strings, extras_json))
+
+
+def read_matches(raw: bytes, offset: int = 0) -> Tuple[List[Dict], int]:
+    """
+    Decode consecutive binary log records, starting at `offset`, back into
+    match dicts
+    
+    Stops at a partial record left by an interrupted write. Returns the
+    matches and the offset just past the last complete record.
+    """
+    matches = []
+    end = len(raw)
+    header_size = MATCH_HEADER.size
+    while offset + header_size <= end:
+        flags, *lengths, extras_len, score, timestamp = \
+            MATCH_HEADER.unpack_from(raw, offset)
+        size = header_size + extras_len + sum(
+            n for n in lengths if n != MATCH_ABSENT)
+        if offset + size > end:
+            break
+        pos = offset + header_size
+        match = {}
+        for key, n in zip(_MATCH_STR_KEYS, lengths):
+            if n != MATCH_ABSENT:
+                match[key] = raw[pos:pos + n].decode()
+                pos += n
+        if flags & _MATCH_HAS_SCORE:
+            match['score'] = score
+        match['timestamp'] = datetime.fromtimestamp(timestamp).isoformat()
+        if extras_len:
+            match.update(decode_json(raw[pos:pos + extras_len]))
+        offset += size
+        matches.append(match)
+    return matches, offset
+
+
+def _sync_log(log_file) -> None:
+    """Flush and fsync an open log file (no-op once it is closed)"""
+    if log_file.closed:
+        return
+    log_file.flush()
+    os.fsync(log_file.fileno())
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """
+    Write a file beside its destination and swap it in, so a crash leaves
+    either the complete old file or the complete new one
+    """
+    tmp_file = path + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+def load_json_file(path: str) -> Any:
+    """
+    Decode a JSON file
+    
+    With orjson, the file is memory-mapped and parsed straight from the
+    page cache rather than read into an intermediate bytes object first.
+    """
+    with open(path, 'rb') as f:
+        if orjson is None or os.fstat(f.fileno()).st_size == 0:
+            # mmap can't map an empty file; let the decoder reject it
+            return decode_json(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
 
 class MemoryStore:
     """
@@ -24,37 +187,216 @@ class MemoryStore:
     - Session history tracking
     """
     
+    # History log records written between automatic checkpoints
+    CHECKPOINT_INTERVAL = 256
+    # Bumped when the persisted stats change shape; snapshots with any
+    # other version have their stats rebuilt from match_history
+    STATS_VERSION = 2
+    
     def __init__(self, storage_file: str = "sessions.json"):
         """Initialize memory store"""
         self.storage_file = storage_file
+        # Append-only binary log (see MATCH_HEADER) of matches recorded
+        # since the last snapshot
+        self.history_log_file = os.path.splitext(storage_file)[0] + '.match_history.bin'
+        # One file per session; only sessions changed since the last save
+        # (flagged dirty by their own mutators) are rewritten
+        self.session_dir = os.path.splitext(storage_file)[0]
         self.sessions: Dict[str, AdoptionSession] = {}
         self.match_history: List[Dict] = []
+        # match_history indexed by adopter_id
+        self._history_by_adopter: Dict[str, List[Dict]] = defaultdict(list)
+        # Running aggregates for get_match_statistics, updated per match
+        self._stats: Dict[str, Any] = self._empty_stats()
         self.load_from_file()
-        print(f"✓ Memory Store initialized (Storage: {storage_file})")
+        # Buffered: records reach the OS when the buffer fills or on
+        # checkpoint(). The finalizer syncs the log when the store is
+        # garbage collected or at interpreter exit, without keeping the
+        # store itself alive.
+        self._history_log = open(self.history_log_file, 'ab')
+        if self._log_end is None:
+            self._reset_log()
+        elif os.fstat(self._history_log.fileno()).st_size > self._log_end:
+            # Drop a partial record so new records append cleanly
+            self._history_log.truncate(self._log_end)
+        self._unsynced = 0
+        self._finalizer = weakref.finalize(self, _sync_log, self._history_log)
+        log.info("✓ Memory Store initialized (Storage: %s)", storage_file)
     
     def load_from_file(self):
-        """Load sessions from JSON file"""
+        """
+        Load sessions from their per-session files, and match history from
+        the JSON snapshot plus the history log
+        """
+        session_from_dict = AdoptionSession.from_dict
+        sessions = self.sessions
+        for path in glob.glob(os.path.join(self.session_dir, '*.json')):
+            try:
+                with open(path, 'rb') as f:
+                    session = session_from_dict(decode_json(f.read()))
+                sessions[session.session_id] = session
+            except (ValueError, KeyError, TypeError, AttributeError):
+                # Corrupt JSON (JSONDecodeError is a ValueError) or a record
+                # missing required fields
+                log.warning("  ⚠ Error reading %s, skipping", path)
+        
+        # Start from scratch so calling this again doesn't double up
+        self.match_history = []
+        self._stats = self._empty_stats()
+        self._history_by_adopter.clear()
+        
+        stats = None
+        self._log_generation = 0
         if os.path.exists(self.storage_file):
             try:
-                with open(self.storage_file, 'r') as f:
-                    data = json.load(f)
-                    self.match_history = data.get('match_history', [])
-                print(f"  ✓ Loaded {len(self.match_history)} historical matches from file")
+                data = load_json_file(self.storage_file)
+                self.match_history = data.get('match_history', [])
+                if data.get('stats_version') == self.STATS_VERSION:
+                    stats = data.get('stats')
+                self._log_generation = data.get('log_generation', 0)
+                self._migrate_legacy_sessions(data.get('sessions', ()))
             except json.JSONDecodeError:
-                print(f"  ⚠ Error reading {self.storage_file}, starting fresh")
+                log.warning("  ⚠ Error reading %s, starting fresh", self.storage_file)
+        
+        # Snapshots written before the counters were persisted, or by an
+        # older version of them, need a scan
+        if stats is None:
+            stats = self._empty_stats()
+            for match in self.match_history:
+                self._count_match(stats, match)
+        else:
+            stats['adopters'] = self._load_adopter_counter(stats['adopters'])
+        
+        # Replay matches recorded after the snapshot was written, unless
+        # the log is from an older generation (already in the snapshot).
+        # _log_end stays None when the log needs resetting.
+        self._log_end = None
+        if os.path.exists(self.history_log_file):
+            with open(self.history_log_file, 'rb') as f:
+                raw = f.read()
+            if (len(raw) >= LOG_HEADER.size
+                    and LOG_HEADER.unpack_from(raw)[0] == self._log_generation):
+                matches, self._log_end = read_matches(raw, LOG_HEADER.size)
+                for match in matches:
+                    self.match_history.append(match)
+                    self._count_match(stats, match)
+        self._stats = stats
+        
+        for match in self.match_history:
+            self._history_by_adopter[match.get('adopter_id')].append(match)
+        
+        # Write out any sessions migrated from an older snapshot
+        self.save_to_file()
+        
+        if self.sessions:
+            log.info("  ✓ Loaded %d sessions from file", len(self.sessions))
+        if self.match_history:
+            log.info("  ✓ Loaded %d historical matches from file", len(self.match_history))
+    
+    def _migrate_legacy_sessions(self, saved_sessions):
+        """
+        Adopt sessions stored in the snapshot by older versions, which kept
+        every session there instead of in per-session files. Sessions that
+        already have their own file take precedence.
+        """
+        for raw in saved_sessions:
+            try:
+                session = AdoptionSession.from_dict(raw)
+            except (ValueError, KeyError, TypeError, AttributeError):
+                log.warning("  ⚠ Skipping unreadable session in %s", self.storage_file)
+                continue
+            if session.session_id not in self.sessions:
+                session.mark_dirty()
+                self.sessions[session.session_id] = session
     
     def save_to_file(self):
-        """Save sessions to JSON file (Persistence)"""
-        data = {
+        """
+        Save changed sessions to their JSON files (Persistence)
+        
+        Only sessions flagged dirty since the last save are serialized;
+        the rest are just a flag check. Match history is persisted by
+        record_match and compact().
+        """
+        dirty = [s for s in self.sessions.values() if s.dirty]
+        if not dirty:
+            return
+        
+        os.makedirs(self.session_dir, exist_ok=True)
+        for session in dirty:
+            session_file = os.path.join(self.session_dir, f"{session.session_id}.json")
+            # orjson serializes the session dataclasses and datetimes
+            # natively, so no to_dict()/isoformat() pass is needed first
+            _write_atomic(session_file, encode_json(session))
+            session.mark_saved()
+        
+        log.debug("  ✓ Saved %d sessions to %s/", len(dirty), self.session_dir)
+    
+    def mark_dirty(self, session_id: str):
+        """
+        Flag a session as changed so the next save_to_file writes it;
+        only needed after editing its fields directly
+        """
+        self.sessions[session_id].mark_dirty()
+    
+    def _snapshot_data(self, log_generation: int) -> Dict[str, Any]:
+        """Contents of the history snapshot"""
+        return {
             'last_saved': datetime.now().isoformat(),
-            'sessions': [s.to_dict() for s in self.sessions.values()],
+            'log_generation': log_generation,
+            'stats_version': self.STATS_VERSION,
+            'stats': dict(self._stats,
+                          adopters=self._dump_adopter_counter(self._stats['adopters'])),
             'match_history': self.match_history
         }
+    
+    def compact(self):
+        """
+        Fold the history log into the snapshot and truncate the log
         
-        with open(self.storage_file, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        The snapshot is only read back by load_from_file, so it is written
+        without indentation (see save_pretty for a readable copy).
+        """
+        data = self._snapshot_data(self._log_generation + 1)
+        
+        _write_atomic(self.storage_file, encode_json(data))
+        
+        self._log_generation += 1
+        self._reset_log()
+        
+        log.debug("  ✓ Saved to %s", self.storage_file)
+    
+    def save_pretty(self, path: str = None) -> str:
+        """
+        Write an indented, human-readable copy of the snapshot for
+        debugging (default: <storage>.pretty.json) and return its path
         
-        print(f"  ✓ Saved to {self.storage_file}")
+        Read-only with respect to the store: the snapshot and history log
+        are left untouched.
+        """
+        if path is None:
+            path = os.path.splitext(self.storage_file)[0] + '.pretty.json'
+        with open(path, 'wb') as f:
+            f.write(encode_json(self._snapshot_data(self._log_generation),
+                                indent=True))
+        return path
+    
+    def _reset_log(self):
+        """Empty the history log and start it at the current generation"""
+        self._history_log.seek(0)
+        self._history_log.truncate()
+        self._history_log.write(LOG_HEADER.pack(self._log_generation))
+        self.checkpoint()
+    
+    def checkpoint(self):
+        """Flush buffered history records and fsync them to disk"""
+        _sync_log(self._history_log)
+        self._unsynced = 0
+    
+    def close(self):
+        """Fold the history log into the snapshot and close the log file"""
+        self.compact()
+        self._finalizer.detach()
+        self._history_log.close()
     
     def create_session(self, session_id: str, adopter_id: str) -> AdoptionSession:
         """
@@ -69,17 +411,19 @@ class MemoryStore:
         """
         session = AdoptionSession(session_id=session_id, adopter_id=adopter_id)
         self.sessions[session_id] = session
+        
+        # New sessions start dirty; this writes only this session's file
         self.save_to_file()
-        print(f"✓ New session created: {session_id}")
+        log.debug("✓ New session created: %s", session_id)
         return session
     
     def get_session(self, session_id: str) -> Optional[AdoptionSession]:
         """Retrieve existing session"""
         session = self.sessions.get(session_id)
         if session:
-            print(f"✓ Session retrieved: {session_id}")
+            log.debug("✓ Session retrieved: %s", session_id)
         else:
-            print(f"⚠ Session not found: {session_id}")
+            log.debug("⚠ Session not found: %s", session_id)
         return session
     
     def record_match(self, match_data: Dict):
@@ -88,37 +432,84 @@ class MemoryStore:
         
         This creates a permanent memory of the match
         """
-        match_data['timestamp'] = datetime.now().isoformat()
+        now = datetime.now()
+        match_data['timestamp'] = now.isoformat()
         self.match_history.append(match_data)
-        self.save_to_file()
-        print(f"✓ Match recorded in history")
+        self._history_by_adopter[match_data.get('adopter_id')].append(match_data)
+        self._count_match(self._stats, match_data)
+        
+        # Append one record instead of rewriting the snapshot
+        self._history_log.write(pack_match(match_data, now))
+        self._unsynced += 1
+        if self._unsynced >= self.CHECKPOINT_INTERVAL:
+            self.checkpoint()
+        log.debug("✓ Match recorded in history")
     
     def get_adopter_history(self, adopter_id: str) -> List[Dict]:
         """Get all matches for specific adopter"""
-        history = [m for m in self.match_history if m.get('adopter_id') == adopter_id]
-        print(f"✓ Retrieved {len(history)} matches for adopter {adopter_id}")
+        history = list(self._history_by_adopter.get(adopter_id, ()))
+        log.debug("✓ Retrieved %d matches for adopter %s", len(history), adopter_id)
         return history
     
     def get_all_sessions(self) -> Dict[str, AdoptionSession]:
         """Get all sessions in memory"""
         return self.sessions
     
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        """Zeroed running aggregates for get_match_statistics"""
+        return {'total': 0, 'score_sum': 0, 'high': 0, 'adopters': DistinctCounter()}
+    
+    @staticmethod
+    def _dump_adopter_counter(counter: DistinctCounter) -> Any:
+        """
+        Snapshot form of the distinct-adopter counter: the adopter keys
+        (see _count_match) while it is exact, base64 sketch registers once
+        past its cutoff
+        """
+        values = counter.exact_values()
+        if values is not None:
+            return [v.decode() for v in values]
+        return base64.b64encode(counter.sketch.to_bytes()).decode()
+    
+    @staticmethod
+    def _load_adopter_counter(saved: Any) -> DistinctCounter:
+        """Restore the distinct-adopter counter from _dump_adopter_counter"""
+        if isinstance(saved, str):
+            return DistinctCounter.from_sketch(
+                HyperLogLog(registers=base64.b64decode(saved)))
+        return DistinctCounter.from_values(v.encode() for v in saved)
+    
+    @staticmethod
+    def _count_match(stats: Dict[str, Any], match: Dict):
+        """Fold one match into the running aggregates"""
+        score = match.get('score', 0)
+        stats['total'] += 1
+        stats['score_sum'] += score
+        stats['high'] += score >= 80
+        # repr keeps the type, so 3 and '3' (or None and 'None') count as
+        # different adopters
+        stats['adopters'].add(repr(match.get('adopter_id')).encode())
+    
     def get_match_statistics(self) -> Dict:
         """Get statistics about matches"""
-        if not self.match_history:
+        total = self._stats['total']
+        if not total:
             return {"total_matches": 0}
         
         stats = {
-            'total_matches': len(self.match_history),
-            'average_score': sum(m.get('score', 0) for m in self.match_history) / len(self.match_history),
-            'high_matches': len([m for m in self.match_history if m.get('score', 0) >= 80]),
-            'total_adopters': len(set(m.get('adopter_id') for m in self.match_history))
+            'total_matches': total,
+            'average_score': self._stats['score_sum'] / total,
+            'high_matches': self._stats['high'],
+            # Exact until the counter's cutoff, then a sketch estimate
+            'total_adopters': self._stats['adopters'].count()
         }
         
         return stats
 
 # Test
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format='%(message)s')
     print("Testing MemoryStore...\n")
     
     store = MemoryStore()
@@ -150,3 +541,5 @@ if __name__ == "__main__":
     stats = store.get_match_statistics()
     print(f"\nStatistics:")
     print(json.dumps(stats, indent=2))
+    
+    store.close()
@@ -33,7 +33,7 @@ if matches:
     best_match = matches[0]
     guidance = support.get_post_adoption_guidance(
         animal_name=best_match['animal_name'],
-        animal_breed=loader.get_animal(best_match['animal_id'])['breed'],
+        animal_breed=best_match['animal_breed'],
         adopter_name=best_match['adopter_name']
     )
     print("\nGuidance provided (first 200 chars):")
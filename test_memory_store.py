@@ -0,0 +1,127 @@
+"""
+Test that the memory store persists sessions, match history and stats
+"""
+
+import os
+import tempfile
+from datetime import datetime
+
+import models.memory_store as memory_store
+from models.adoption_session import AdoptionMatch
+from models.memory_store import LOG_HEADER, MemoryStore, pack_match
+
+print("="*60)
+print("TESTING MEMORY STORE")
+print("="*60)
+
+MATCHES = [
+    {'animal_id': '1', 'animal_name': 'Buddy', 'adopter_id': '1', 'score': 85},
+    {'animal_id': '2', 'animal_name': 'Whiskers', 'adopter_id': '2', 'score': 40},
+    {'animal_id': '3', 'animal_name': 'Max', 'adopter_id': 3, 'score': 70,
+     'reasoning': 'Non-string ID and an extra key'},
+]
+
+SESSION_MATCH = AdoptionMatch(animal_id='1', adopter_id='1', animal_name='Buddy',
+                              adopter_name='Alex', score=85)
+
+
+def record_all(store, matches):
+    for match in matches:
+        store.record_match(dict(match))
+
+
+tmp_dir = tempfile.TemporaryDirectory()
+
+# TEST 1: Records come back from the log when the store is reopened
+print("\n[TEST 1] Record matches, then reopen without closing...")
+storage_file = os.path.join(tmp_dir.name, 'test1.json')
+store = MemoryStore(storage_file)
+store.create_session('s1', '1').add_match(SESSION_MATCH)
+store.save_to_file()
+record_all(store, MATCHES)
+store.checkpoint()
+history = store.match_history
+stats = store.get_match_statistics()
+
+reopened = MemoryStore(storage_file)
+assert reopened.match_history == history, reopened.match_history
+assert reopened.get_match_statistics() == stats, reopened.get_match_statistics()
+assert reopened.get_adopter_history(3) == [history[2]]
+assert list(reopened.sessions) == ['s1']
+assert reopened.sessions['s1'].matches[0].animal_id == '1'
+print(f"✓ {len(history)} matches and stats restored: {stats}")
+
+# TEST 2: close() folds the log into the snapshot
+print("\n[TEST 2] Close, then reopen from the snapshot...")
+reopened.close()
+store.close()
+reopened = MemoryStore(storage_file)
+assert reopened.match_history == history
+assert reopened.get_match_statistics() == stats
+reopened.close()
+print(f"✓ {len(history)} matches restored after close()")
+
+# TEST 3: A partial trailing record is dropped, and new records follow it
+print("\n[TEST 3] Truncated trailing record...")
+storage_file = os.path.join(tmp_dir.name, 'test3.json')
+store = MemoryStore(storage_file)
+record_all(store, MATCHES[:2])
+store.checkpoint()
+history = store.match_history
+with open(store.history_log_file, 'ab') as f:
+    f.write(pack_match(MATCHES[2], datetime.now())[:-3])
+
+reopened = MemoryStore(storage_file)
+assert reopened.match_history == history, reopened.match_history
+record_all(reopened, MATCHES[2:])
+reopened.checkpoint()
+history = reopened.match_history
+assert MemoryStore(storage_file).match_history == history
+print(f"✓ Partial record dropped, {len(history)} matches after appending")
+
+# TEST 4: A log from an older generation is already in the snapshot
+print("\n[TEST 4] Stale-generation log...")
+storage_file = os.path.join(tmp_dir.name, 'test4.json')
+store = MemoryStore(storage_file)
+record_all(store, MATCHES)
+history = store.match_history
+store.close()
+# As if a crash hit after the snapshot was swapped in but before the log
+# was reset
+with open(store.history_log_file, 'wb') as f:
+    f.write(LOG_HEADER.pack(store._log_generation - 1))
+    f.write(pack_match(MATCHES[0], datetime.now()))
+
+reopened = MemoryStore(storage_file)
+assert reopened.match_history == history, reopened.match_history
+assert reopened.get_match_statistics()['total_matches'] == len(MATCHES)
+reopened.close()
+print(f"✓ Stale log ignored, {len(history)} matches")
+
+# TEST 5: Everything still round-trips with the stdlib JSON encoder
+print("\n[TEST 5] Without orjson...")
+saved_orjson, memory_store.orjson = memory_store.orjson, None
+try:
+    storage_file = os.path.join(tmp_dir.name, 'test5.json')
+    store = MemoryStore(storage_file)
+    store.create_session('s1', '1').add_match(SESSION_MATCH)
+    store.save_to_file()
+    record_all(store, MATCHES)
+    history = store.match_history
+    stats = store.get_match_statistics()
+    store.close()
+
+    reopened = MemoryStore(storage_file)
+    assert reopened.match_history == history
+    assert reopened.get_match_statistics() == stats
+    assert reopened.sessions['s1'].matches[0].animal_id == '1'
+    reopened.close()
+finally:
+    memory_store.orjson = saved_orjson
+print(f"✓ {len(history)} matches and 1 session restored with the json module")
+
+tmp_dir.cleanup()
+
+print("\n" + "="*60)
+print("✓ TESTS PASSED - Memory store working!")
+print("="*60)
@@ -2,6 +2,8 @@
 Quick test to verify both tools work correctly
 """
 
+import numpy as np
+
 from tools.data_loader import DataLoader
 from tools.compatibility_scorer import CompatibilityScorer
 
@@ -34,6 +36,26 @@ score, reasoning = scorer.calculate_compatibility(animal, adopter)
 print(f"\nCompatibility Score: {score}/100")
 print(f"Reasoning:\n{reasoning}")
 
+# TEST 3: Batch scoring agrees with per-pair scoring
+print("\n[TEST 3] CompatibilityScorer - Batch scoring all animals...")
+batch_scores = scorer.score_all(data_loader.animal_matrix, adopter)
+for a, batch_score in zip(data_loader.get_all_animals(), batch_scores):
+    expected, _ = scorer.calculate_compatibility(a, adopter)
+    assert int(batch_score) == expected, f"{a['name']}: {batch_score} != {expected}"
+print(f"✓ Batch scores match for {len(batch_scores)} animals")
+
+# TEST 4: Pairwise batch scoring (every adopter x every animal)
+print("\n[TEST 4] CompatibilityScorer - Scoring all adopter/animal pairs...")
+adopter_idx = np.arange(len(data_loader.adopters))[:, None]
+animal_idx = np.arange(len(data_loader.animals))[None, :]
+pair_scores = scorer.score_batch(data_loader.animal_matrix, data_loader.adopter_matrix,
+                                 animal_idx, adopter_idx)
+for i, ad in enumerate(data_loader.get_all_adopters()):
+    for j, a in enumerate(data_loader.get_all_animals()):
+        expected, _ = scorer.calculate_compatibility(a, ad)
+        assert int(pair_scores[i, j]) == expected, f"{a['name']}/{ad['name']}"
+print(f"✓ Pair scores match for {pair_scores.size} pairs")
+
 print("\n" + "="*60)
 print("✓ TESTS PASSED - Both tools working!")
 print("="*60)
@@ -1,8 +1,168 @@
-from typing import Dict, Any, Tuple
+import re
+from functools import lru_cache
+from typing import Dict, Any, Sequence, Tuple
+
+import numpy as np
+
+from tools.compatibility_scorer_jit import NUMBA_AVAILABLE, PARALLEL_THRESHOLD
+from tools.compatibility_scorer_jit import score_all as score_all_kernel
+from tools.compatibility_scorer_jit import score_all_parallel as score_all_parallel_kernel
+
+# Map text to numeric values (1=low, 2=medium, 3=high)
+ENERGY_LEVELS = {'low': 1, 'medium': 2, 'high': 3}
+LIFESTYLE_LEVELS = {
+    'quiet': 1, 
+    'relaxed': 1, 
+    'moderate': 2, 
+    'active': 3, 
+    'outdoor-person': 3,
+    'family-focused': 2,
+    'busy': 1
+}
+
+# Lifestyle score indexed by |animal_level - adopter_level|
+LIFESTYLE_SCORES = np.array([100, 70, 40], dtype=np.int16)
+
+# Encoded categories used by the lookup tables below
+SIZE_CODES = {'small': 0, 'medium': 1, 'large': 2}
+EXPERIENCE_CODES = {'beginner': 0, 'experienced': 1}    # anything else: 2
+COMMITMENT_CODES = {'high': 0, 'medium': 1}             # anything else: 2
+
+# Factor lookup tables; each replaces an if/elif chain in a _score_* method
+# [animal energy level - 1][adopter lifestyle level - 1]
+LIFESTYLE_LUT = ((100, 70, 40), (70, 100, 70), (40, 70, 100))
+# [animal has special needs][experience code]
+EXPERIENCE_LUT = ((90, 100, 100), (40, 100, 100))
+# [adopter lives in a house][size code]
+HOME_LUT = ((85, 85, 40), (90, 90, 100))
+# [animal has special needs][commitment code]
+SPECIAL_NEEDS_LUT = ((100, 100, 100), (95, 60, 30))
+
+
+@lru_cache(maxsize=None)
+def _score_breakdown(lifestyle: int, experience: int, home: int,
+                     behavior: int, special: int) -> str:
+    """
+    Score lines of the reasoning text
+    
+    Each factor only takes a handful of values, so the same few breakdowns
+    repeat across pairs; cache them instead of re-formatting every time.
+    """
+    return (
+        f"- Lifestyle Compatibility: {lifestyle}/100\n"
+        f"- Experience Match: {experience}/100\n"
+        f"- Home Fit: {home}/100\n"
+        f"- Behavioral Compatibility: {behavior}/100\n"
+        f"- Special Needs Capability: {special}/100\n"
+    )
+
+
+def normalize_animal(animal: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Pre-parsed scoring fields for an animal row
+    
+    Kept apart from the row itself; the _score_* methods read these so they
+    don't repeat .lower()/breed scans for every pair.
+    """
+    return {
+        '_energy_lvl': ENERGY_LEVELS.get(animal.get('energy_level', 'medium').lower(), 2),
+        '_size': SIZE_CODES[CompatibilityScorer._estimate_size(animal.get('breed', ''))],
+        '_good_kids': animal.get('good_with_kids', 'no').lower() == 'yes',
+        '_good_dogs': animal.get('good_with_dogs', 'no').lower() == 'yes',
+        '_special_needs': animal.get('special_needs', 'no').lower() == 'yes',
+    }
+
+
+def normalize_adopter(adopter: Dict[str, Any]) -> Dict[str, Any]:
+    """Pre-parsed scoring fields for an adopter row (see normalize_animal)"""
+    return {
+        '_lifestyle_lvl': LIFESTYLE_LEVELS.get(adopter.get('lifestyle', 'moderate').lower(), 2),
+        '_has_kids': adopter.get('has_kids', 'no').lower() == 'yes',
+        '_has_pets': adopter.get('has_other_pets', 'no').lower() == 'yes',
+        '_experience': EXPERIENCE_CODES.get(
+            adopter.get('experience_level', 'beginner').lower(), 2),
+        '_commitment': COMMITMENT_CODES.get(
+            adopter.get('commitment_level', 'medium').lower(), 2),
+        '_is_house': adopter.get('home_type', 'apartment').lower() == 'house',
+    }
+
+
+# Raw columns each normalized record is derived from
+_ANIMAL_SCORING_KEYS = ('energy_level', 'breed', 'good_with_kids',
+                        'good_with_dogs', 'special_needs')
+_ADOPTER_SCORING_KEYS = ('lifestyle', 'has_kids', 'has_other_pets',
+                         'experience_level', 'commitment_level', 'home_type')
+
+
+@lru_cache(maxsize=4096)
+def _normalize_animal_values(values: Tuple[Any, ...]) -> Dict[str, Any]:
+    """normalize_animal memoized on the raw scoring values (treat as read-only)"""
+    return normalize_animal({k: v for k, v in zip(_ANIMAL_SCORING_KEYS, values)
+                             if v is not None})
+
+
+@lru_cache(maxsize=4096)
+def _normalize_adopter_values(values: Tuple[Any, ...]) -> Dict[str, Any]:
+    """normalize_adopter memoized on the raw scoring values (treat as read-only)"""
+    return normalize_adopter({k: v for k, v in zip(_ADOPTER_SCORING_KEYS, values)
+                              if v is not None})
+
+
+def _normalized_animal(animal: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Scoring fields for an animal row
+    
+    Looked up by the row's current values, so edits to a row are always
+    picked up, while repeated values (most of a catalog) are parsed once.
+    """
+    return _normalize_animal_values(tuple(map(animal.get, _ANIMAL_SCORING_KEYS)))
+
+
+def _normalized_adopter(adopter: Dict[str, Any]) -> Dict[str, Any]:
+    """Scoring fields for an adopter row (see _normalized_animal)"""
+    return _normalize_adopter_values(tuple(map(adopter.get, _ADOPTER_SCORING_KEYS)))
+
+
+def encode_animals(animals: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Encode the animal catalog as one NumPy column per scoring field
+    
+    The columns line up with the order of `animals`, so index i in every
+    array describes animals[i]. Used by CompatibilityScorer.score_all and
+    score_batch.
+    """
+    fields = [_normalized_animal(a) for a in animals]
+    
+    def column(key: str, dtype) -> np.ndarray:
+        return np.array([f[key] for f in fields], dtype=dtype)
+    
+    return {
+        'energy_level': column('_energy_lvl', np.int8),
+        'is_large': np.array(
+            [f['_size'] == SIZE_CODES['large'] for f in fields], dtype=bool),
+        'good_with_kids': column('_good_kids', bool),
+        'good_with_dogs': column('_good_dogs', bool),
+        'special_needs': column('_special_needs', bool),
+    }
+
+
+def encode_adopters(adopters: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """
+    Encode adopters as a 2D array, one CompatibilityScorer adopter vector
+    per row, in the order of `adopters`. Used by score_batch.
+    """
+    if not adopters:
+        return np.empty((0, 8), dtype=np.int16)
+    return np.stack([CompatibilityScorer._adopter_vector(a) for a in adopters])
+
 
 class CompatibilityScorer:
     """Calculate adoption compatibility scores between animals and adopters"""
     
+    # Breed keywords for _estimate_size, each set matched in a single pass
+    _LARGE_RE = re.compile(r'retriever|shepherd|labrador|pit bull', re.I)
+    _SMALL_RE = re.compile(r'cat|tabby|persian|beagle', re.I)
+    
     def __init__(self):
         """
         Initialize with scoring weights
@@ -15,6 +175,10 @@ class CompatibilityScorer:
             'behavioral_fit': 0.20,       # Are they compatible (kids/pets)
             'special_needs': 0.10         # Can adopter handle special needs
         }
+        # Same weights in factor order, for the unrolled weighted sum in
+        # calculate_compatibility and for the batch scoring path
+        self._weight_values = tuple(self.weights.values())
+        self._weights_array = np.array(self._weight_values, dtype=np.float64)
     
     def calculate_compatibility(self, animal: Dict[str, Any], 
                                adopter: Dict[str, Any]) -> Tuple[int, str]:
@@ -29,27 +193,156 @@ class CompatibilityScorer:
             # Returns: (85, "Score breakdown: ...")
         """
         
+        # Parse the scoring fields once rather than in every _score_* method
+        animal_fields = _normalized_animal(animal)
+        adopter_fields = _normalized_adopter(adopter)
+        
         # Calculate individual scores for each aspect (all 0-100)
-        scores = {
-            'lifestyle_match': self._score_lifestyle(animal, adopter),
-            'experience_match': self._score_experience(animal, adopter),
-            'home_fit': self._score_home(animal, adopter),
-            'behavioral_fit': self._score_behavior(animal, adopter),
-            'special_needs': self._score_special_needs(animal, adopter)
-        }
+        lifestyle = self._score_lifestyle(animal_fields, adopter_fields)
+        experience = self._score_experience(animal_fields, adopter_fields)
+        home = self._score_home(animal_fields, adopter_fields)
+        behavior = self._score_behavior(animal_fields, adopter_fields)
+        special = self._score_special_needs(animal_fields, adopter_fields)
         
         # Calculate WEIGHTED total score
         # Example: 85 * 0.30 + 90 * 0.20 + ... = final_score
-        total_score = sum(
-            scores[key] * self.weights[key] 
-            for key in scores.keys()
-        )
+        w_lifestyle, w_experience, w_home, w_behavior, w_special = self._weight_values
+        total_score = (lifestyle * w_lifestyle + experience * w_experience
+                       + home * w_home + behavior * w_behavior
+                       + special * w_special)
+        
+        scores = {
+            'lifestyle_match': lifestyle,
+            'experience_match': experience,
+            'home_fit': home,
+            'behavioral_fit': behavior,
+            'special_needs': special
+        }
         
         # Generate human-readable explanation
         reasoning = self._generate_reasoning(animal, adopter, scores)
         
         return int(total_score), reasoning
     
+    def score_all(self, animal_matrix: Dict[str, np.ndarray],
+                  adopter: Dict[str, Any],
+                  out: np.ndarray = None) -> np.ndarray:
+        """
+        Score one adopter against every animal at once
+        
+        Vectorized equivalent of calculate_compatibility over the columns
+        built by encode_animals. Returns an int array of scores (0-100)
+        aligned with the animal catalog; no reasoning text is produced.
+        Uses the Numba kernel when available, otherwise plain NumPy.
+        """
+        adopter_vec = self._adopter_vector(adopter)
+        energy = animal_matrix['energy_level']
+        if out is None:
+            out = np.empty(energy.shape[0], dtype=np.int64)
+        
+        if NUMBA_AVAILABLE:
+            kernel = (score_all_parallel_kernel
+                      if energy.shape[0] >= PARALLEL_THRESHOLD
+                      else score_all_kernel)
+            return kernel(
+                energy,
+                animal_matrix['is_large'],
+                animal_matrix['good_with_kids'],
+                animal_matrix['good_with_dogs'],
+                animal_matrix['special_needs'],
+                adopter_vec,
+                LIFESTYLE_SCORES,
+                self._weights_array,
+                out
+            )
+        
+        out[:] = self._score_columns(
+            energy,
+            animal_matrix['is_large'],
+            animal_matrix['good_with_kids'],
+            animal_matrix['good_with_dogs'],
+            animal_matrix['special_needs'],
+            adopter_vec
+        )
+        return out
+    
+    def score_batch(self, animal_matrix: Dict[str, np.ndarray],
+                    adopter_matrix: np.ndarray,
+                    animal_idx: np.ndarray,
+                    adopter_idx: np.ndarray) -> np.ndarray:
+        """
+        Score many (animal, adopter) pairs at once
+        
+        Pair i is animal_idx[i] (a row of encode_animals' columns) against
+        adopter_idx[i] (a row of encode_adopters' matrix). Broadcasting
+        index arrays also works, e.g. animal_idx[None, :] with
+        adopter_idx[:, None] scores every adopter against every animal.
+        """
+        return self._score_columns(
+            animal_matrix['energy_level'][animal_idx],
+            animal_matrix['is_large'][animal_idx],
+            animal_matrix['good_with_kids'][animal_idx],
+            animal_matrix['good_with_dogs'][animal_idx],
+            animal_matrix['special_needs'][animal_idx],
+            adopter_matrix[adopter_idx]
+        )
+    
+    def _score_columns(self, energy, is_large, good_with_kids, good_with_dogs,
+                       special, adopter) -> np.ndarray:
+        """
+        NumPy scoring over animal columns and encoded adopter(s)
+        
+        `adopter` is one encoded adopter vector or a stack of them whose
+        leading dimensions broadcast against the animal columns.
+        """
+        diff = np.abs(energy.astype(np.int16) - adopter[..., 0])
+        lifestyle = LIFESTYLE_SCORES[diff]
+        experience = np.where(special, adopter[..., 1], adopter[..., 2])
+        home = np.where(is_large, adopter[..., 3], adopter[..., 4])
+        behavior = (100
+                    - adopter[..., 5] * ~good_with_kids
+                    - adopter[..., 6] * ~good_with_dogs)
+        behavior = np.maximum(behavior, 10)
+        special_score = np.where(special, adopter[..., 7], 100)
+        
+        # Same accumulation order as calculate_compatibility so the
+        # truncated integer scores agree exactly (a BLAS dot product
+        # may reorder or fuse the sum)
+        w = self._weights_array
+        total = lifestyle * w[0]
+        total = total + experience * w[1]
+        total = total + home * w[2]
+        total = total + behavior * w[3]
+        total = total + special_score * w[4]
+        
+        return total.astype(np.int64)
+    
+    @staticmethod
+    def _adopter_vector(adopter: Dict[str, Any]) -> np.ndarray:
+        """
+        Pre-resolve everything about the adopter that score_all needs
+        
+        Each factor only depends on a yes/no (or size) flag on the animal
+        side, so the adopter reduces to the scores for either case.
+        """
+        adopter = _normalized_adopter(adopter)
+        is_house = adopter['_is_house']
+        has_kids = adopter['_has_kids']
+        has_other_pets = adopter['_has_pets']
+        experience = adopter['_experience']
+        large, other = SIZE_CODES['large'], SIZE_CODES['medium']
+        
+        return np.array([
+            adopter['_lifestyle_lvl'],
+            EXPERIENCE_LUT[1][experience],      # special needs animal
+            EXPERIENCE_LUT[0][experience],      # other animals
+            HOME_LUT[is_house][large],          # large animal
+            HOME_LUT[is_house][other],          # other animals
+            40 if has_kids else 0,              # penalty if not good with kids
+            30 if has_other_pets else 0,        # penalty if not good with dogs
+            SPECIAL_NEEDS_LUT[1][adopter['_commitment']]
+        ], dtype=np.int16)
+    
     def _score_lifestyle(self, animal: Dict, adopter: Dict) -> int:
         """
         Score lifestyle compatibility (0-100)
@@ -58,32 +351,7 @@ class CompatibilityScorer:
         - High-energy dog + Active person = HIGH score
         - High-energy dog + Quiet person = LOW score
         """
-        animal_energy = animal.get('energy_level', 'medium').lower()
-        adopter_lifestyle = adopter.get('lifestyle', 'moderate').lower()
-        
-        # Map text to numeric values (1=low, 2=medium, 3=high)
-        energy_map = {'low': 1, 'medium': 2, 'high': 3}
-        lifestyle_map = {
-            'quiet': 1, 
-            'relaxed': 1, 
-            'moderate': 2, 
-            'active': 3, 
-            'outdoor-person': 3,
-            'family-focused': 2,
-            'busy': 1
-        }
-        
-        animal_level = energy_map.get(animal_energy, 2)
-        adopter_level = lifestyle_map.get(adopter_lifestyle, 2)
-        
-        # Calculate score based on difference
-        diff = abs(animal_level - adopter_level)
-        if diff == 0:
-            return 100  # Perfect match
-        elif diff == 1:
-            return 70   # Close match
-        else:
-            return 40   # Poor match
+        return LIFESTYLE_LUT[animal['_energy_lvl'] - 1][adopter['_lifestyle_lvl'] - 1]
     
     def _score_experience(self, animal: Dict, adopter: Dict) -> int:
         """
@@ -93,17 +361,7 @@ class CompatibilityScorer:
         - Animal needs training + Experienced adopter = HIGH
         - Animal needs training + Beginner adopter = LOW
         """
-        animal_needs_training = animal.get('special_needs', '').lower() == 'yes'
-        adopter_experience = adopter.get('experience_level', 'beginner').lower()
-        
-        if animal_needs_training and adopter_experience == 'experienced':
-            return 100  # Expert handling difficult animal
-        elif animal_needs_training and adopter_experience == 'beginner':
-            return 40   # Beginner with difficult animal = risky
-        elif not animal_needs_training and adopter_experience == 'beginner':
-            return 90   # Beginner with easy animal = good
-        else:
-            return 100  # Experienced with any animal = good
+        return EXPERIENCE_LUT[animal['_special_needs']][adopter['_experience']]
     
     def _score_home(self, animal: Dict, adopter: Dict) -> int:
         """
@@ -113,31 +371,14 @@ class CompatibilityScorer:
         - Large dog + House = HIGH
         - Large dog + Apartment = LOW
         """
-        animal_size = self._estimate_size(animal.get('breed', ''))
-        home_type = adopter.get('home_type', 'apartment').lower()
-        
-        if home_type == 'house':
-            # Houses fit most animals well
-            if animal_size == 'large':
-                return 100
-            else:
-                return 90
-        else:  # apartment
-            # Apartments better for small/calm animals
-            if animal_size == 'large':
-                return 40
-            else:
-                return 85
-    
-    def _estimate_size(self, breed: str) -> str:
+        return HOME_LUT[adopter['_is_house']][animal['_size']]
+    
+    @classmethod
+    def _estimate_size(cls, breed: str) -> str:
         """Estimate animal size from breed name"""
-        large_breeds = ['retriever', 'shepherd', 'labrador', 'pit bull']
-        small_breeds = ['cat', 'tabby', 'persian', 'beagle']
-        
-        breed_lower = breed.lower()
-        if any(b in breed_lower for b in large_breeds):
+        if cls._LARGE_RE.search(breed):
             return 'large'
-        elif any(b in breed_lower for b in small_breeds):
+        elif cls._SMALL_RE.search(breed):
             return 'small'
         else:
             return 'medium'
@@ -150,23 +391,13 @@ class CompatibilityScorer:
         - Animal good with kids + Adopter has kids = HIGH
         - Animal NOT good with kids + Adopter has kids = LOW
         """
-        has_kids = adopter.get('has_kids', 'no').lower() == 'yes'
-        has_other_pets = adopter.get('has_other_pets', 'no').lower() == 'yes'
-        
-        animal_good_kids = animal.get('good_with_kids', 'no').lower() == 'yes'
-        animal_good_pets = animal.get('good_with_dogs', 'no').lower() == 'yes'
-        
-        score = 100
-        
-        # Penalize if adopter has kids but animal not safe with them
-        if has_kids and not animal_good_kids:
-            score -= 40  # Major penalty
-        
-        # Penalize if adopter has pets but animal not compatible
-        if has_other_pets and not animal_good_pets:
-            score -= 30  # Moderate penalty
-        
-        return max(score, 10)  # Keep minimum score of 10
+        # Penalize if adopter has kids but animal not safe with them (major),
+        # or has pets the animal isn't compatible with (moderate); booleans
+        # act as 0/1 so there is no branching. Minimum score is 10.
+        score = (100
+                 - 40 * (adopter['_has_kids'] and not animal['_good_kids'])
+                 - 30 * (adopter['_has_pets'] and not animal['_good_dogs']))
+        return max(score, 10)
     
     def _score_special_needs(self, animal: Dict, adopter: Dict) -> int:
         """
@@ -176,18 +407,7 @@ class CompatibilityScorer:
         - Animal has special needs + High commitment adopter = GOOD
         - Animal has special needs + Low commitment adopter = BAD
         """
-        has_special_needs = animal.get('special_needs', 'no').lower() == 'yes'
-        commitment = adopter.get('commitment_level', 'medium').lower()
-        
-        if not has_special_needs:
-            return 100  # No special needs = no problem
-        
-        if commitment == 'high':
-            return 95   # High commitment can handle it
-        elif commitment == 'medium':
-            return 60   # Medium commitment is risky
-        else:
-            return 30   # Low commitment = won't work
+        return SPECIAL_NEEDS_LUT[animal['_special_needs']][adopter['_commitment']]
     
     def _generate_reasoning(self, animal: Dict, adopter: Dict, 
                           scores: Dict[str, int]) -> str:
@@ -199,10 +419,12 @@ class CompatibilityScorer:
         adopter_name = adopter.get('name', 'Unknown')
         
         reasoning = f"Match Analysis: {animal_name} ↔ {adopter_name}\n"
-        reasoning += f"- Lifestyle Compatibility: {scores['lifestyle_match']}/100\n"
-        reasoning += f"- Experience Match: {scores['experience_match']}/100\n"
-        reasoning += f"- Home Fit: {scores['home_fit']}/100\n"
-        reasoning += f"- Behavioral Compatibility: {scores['behavioral_fit']}/100\n"
-        reasoning += f"- Special Needs Capability: {scores['special_needs']}/100\n"
+        reasoning += _score_breakdown(
+            scores['lifestyle_match'],
+            scores['experience_match'],
+            scores['home_fit'],
+            scores['behavioral_fit'],
+            scores['special_needs']
+        )
         
         return reasoning
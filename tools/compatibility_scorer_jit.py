@@ -0,0 +1,86 @@
+"""
+JIT-compiled batch scoring kernel (optional)
+
+Compiles the inner loop of CompatibilityScorer.score_all with Numba when it
+is installed, with a multi-threaded variant for very large catalogs.
+Without Numba, NUMBA_AVAILABLE is False and the scorer keeps using its NumPy
+implementation.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+# Catalogs at least this large are scored with the multi-threaded kernel;
+# below it, thread start-up costs more than the loop itself
+PARALLEL_THRESHOLD = 50_000
+
+
+def _score_all(energy, is_large, good_with_kids, good_with_dogs, special,
+               adopter_vec, lifestyle_scores, weights, out):
+    """
+    Score every animal against one encoded adopter, writing into `out`
+
+    adopter_vec layout (see CompatibilityScorer._adopter_vector):
+        0 lifestyle level, 1 experience score if special needs,
+        2 experience score otherwise, 3 home score if large,
+        4 home score otherwise, 5 kids penalty, 6 pets penalty,
+        7 special needs score
+
+    The loop body is branchless (booleans used as 0/1 multipliers) so LLVM
+    can vectorize it. Weighted terms are added in the same order as
+    calculate_compatibility, so truncated scores match it exactly.
+    """
+    level = adopter_vec[0]
+    for i in prange(energy.shape[0]):
+        diff = energy[i] - level
+        diff = diff * (1 - 2 * (diff < 0))
+        lifestyle = lifestyle_scores[diff]
+        s = special[i]
+        experience = adopter_vec[2] + (adopter_vec[1] - adopter_vec[2]) * s
+        home = adopter_vec[4] + (adopter_vec[3] - adopter_vec[4]) * is_large[i]
+        behavior = (100
+                    - adopter_vec[5] * (1 - good_with_kids[i])
+                    - adopter_vec[6] * (1 - good_with_dogs[i]))
+        behavior = max(behavior, 10)
+        special_score = 100 + (adopter_vec[7] - 100) * s
+
+        total = lifestyle * weights[0]
+        total = total + experience * weights[1]
+        total = total + home * weights[2]
+        total = total + behavior * weights[3]
+        total = total + special_score * weights[4]
+        out[i] = int(total)
+    return out
+
+
+if NUMBA_AVAILABLE:
+    # No fastmath: reassociating the weighted sum could change the
+    # truncated integer scores.
+    score_all = njit(cache=True)(_score_all)
+    # Same loop with iterations spread over threads. Not disk-cached:
+    # Numba's cache index doesn't key on the parallel flag, so it would
+    # share (and clash with) score_all's cache entries. It only compiles
+    # the first time a catalog reaches PARALLEL_THRESHOLD.
+    score_all_parallel = njit(parallel=True)(_score_all)
+else:
+    score_all = _score_all
+    score_all_parallel = _score_all
+
+
+def warm_up():
+    """Trigger compilation (or load from cache) on a one-animal dummy input"""
+    if not NUMBA_AVAILABLE:
+        return
+    one = np.ones(1, dtype=np.int8)
+    flag = np.zeros(1, dtype=np.bool_)
+    score_all(one, flag, flag, flag, flag,
+              np.zeros(8, dtype=np.int16),
+              np.zeros(3, dtype=np.int16),
+              np.zeros(5, dtype=np.float64),
+              np.empty(1, dtype=np.int64))
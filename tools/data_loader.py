@@ -1,6 +1,60 @@
 import csv
+import functools
 import json
-from typing import Dict, List, Any
+import logging
+import os
+from typing import Dict, List, Tuple, Any
+
+from tools.compatibility_scorer import encode_adopters, encode_animals
+from tools import compatibility_scorer_jit
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # fall back to csv.DictReader
+    pa = None
+
+log = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_csv_cached(filepath: str, mtime_ns: int) -> Tuple[Tuple[Tuple[str, Any], ...], ...]:
+    """
+    Parse a CSV file into immutable rows of (column, value) pairs
+    
+    Keyed on the absolute path and the file's mtime, so an edited file is
+    re-read while DataLoaders built from an unchanged file share one parse.
+    Each DataLoader turns the rows into its own dicts.
+    """
+    rows = None
+    if pa is not None:
+        with open(filepath, 'r') as f:
+            header = next(csv.reader(f), [])
+        try:
+            rows = _load_csv_arrow(filepath, header) if header else []
+        except pa.ArrowInvalid:
+            # Ragged rows; csv.DictReader pads short rows with None
+            rows = None
+    if rows is None:
+        with open(filepath, 'r') as f:
+            rows = list(csv.DictReader(f))
+    return tuple(tuple(row.items()) for row in rows)
+
+
+def _load_csv_arrow(filepath: str, header: List[str]) -> List[Dict[str, Any]]:
+    """
+    Load CSV file with PyArrow's multithreaded native reader
+    
+    Every column is read as a string so rows match what csv.DictReader
+    would produce (IDs stay '1', not 1).
+    """
+    table = pa_csv.read_csv(
+        filepath,
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in header}
+        )
+    )
+    return table.to_pylist()
 
 class DataLoader:
     """Load and structure adoption data from CSV files"""
@@ -13,55 +67,170 @@ class DataLoader:
             animal_file: Path to animal_data.csv
             adopter_file: Path to adopter_data.csv
         """
+        # Rows are read-only for the run, so keep them as tuples that
+        # callers can iterate directly without copying
         self.animals = self._load_csv(animal_file)
         self.adopters = self._load_csv(adopter_file)
-        print(f"✓ Loaded {len(self.animals)} animals")
-        print(f"✓ Loaded {len(self.adopters)} adopters")
+        # ID indexes for O(1) lookups (first row wins on duplicate IDs)
+        self._animals_by_id = {a['animal_id']: a for a in reversed(self.animals)}
+        self._adopters_by_id = {a['adopter_id']: a for a in reversed(self.adopters)}
+        # Rendered agent text per ID, kept off the rows themselves
+        self._animal_texts = {
+            animal_id: self._build_animal_agent_text(a)
+            for animal_id, a in self._animals_by_id.items()
+        }
+        self._adopter_texts = {
+            adopter_id: self._build_adopter_agent_text(a)
+            for adopter_id, a in self._adopters_by_id.items()
+        }
+        # Column-wise (struct-of-arrays) view of the animals for batch scoring
+        self.animal_matrix = encode_animals(self.animals)
+        # One encoded row per adopter, for scoring many pairs at once
+        self.adopter_matrix = encode_adopters(self.adopters)
+        compatibility_scorer_jit.warm_up()
+        # Source data is static for a run, so each profile is parsed on
+        # first request and memoized; parsing lazily keeps one malformed
+        # row from failing the whole load
+        self._animal_profiles: Dict[str, Dict[str, Any]] = {}
+        self._adopter_profiles: Dict[str, Dict[str, Any]] = {}
+        log.info("✓ Loaded %d animals", len(self.animals))
+        log.info("✓ Loaded %d adopters", len(self.adopters))
     
-    def _load_csv(self, filepath: str) -> List[Dict[str, Any]]:
+    def _load_csv(self, filepath: str) -> Tuple[Dict[str, Any], ...]:
         """
-        Load CSV file into list of dictionaries
+        Load CSV file into a tuple of dictionaries
         
-        Each row becomes a dictionary with column names as keys
+        Each row becomes a dictionary with column names as keys. Parsing is
+        cached per process; the dicts are new for every DataLoader.
         """
-        data = []
         try:
-            with open(filepath, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    data.append(row)
-            return data
+            path = os.path.abspath(filepath)
+            rows = _load_csv_cached(path, os.stat(path).st_mtime_ns)
+            return tuple(dict(row) for row in rows)
         except FileNotFoundError:
-            print(f"ERROR: File not found - {filepath}")
-            return []
+            log.error("ERROR: File not found - %s", filepath)
+            return ()
     
     def get_animal(self, animal_id: str) -> Dict[str, Any]:
         """Retrieve specific animal by ID"""
-        for animal in self.animals:
-            if animal['animal_id'] == animal_id:
-                return animal
-        return None
+        return self._animals_by_id.get(animal_id)
     
     def get_adopter(self, adopter_id: str) -> Dict[str, Any]:
         """Retrieve specific adopter by ID"""
-        for adopter in self.adopters:
-            if adopter['adopter_id'] == adopter_id:
-                return adopter
-        return None
+        return self._adopters_by_id.get(adopter_id)
+    
+    def get_animal_profile(self, animal_id: str) -> Dict[str, Any]:
+        """Retrieve the (memoized) profile of a specific animal by ID"""
+        profile = self._animal_profiles.get(animal_id)
+        if profile is None:
+            # Built from the ID index, so the same first-row-wins rule as
+            # get_animal applies
+            animal = self._animals_by_id.get(animal_id)
+            if animal is None:
+                return None
+            profile = self._animal_profiles[animal_id] = self._build_animal_profile(animal)
+        return profile
     
-    def get_all_animals(self) -> List[Dict[str, Any]]:
+    def get_adopter_profile(self, adopter_id: str) -> Dict[str, Any]:
+        """Retrieve the (memoized) profile of a specific adopter by ID"""
+        profile = self._adopter_profiles.get(adopter_id)
+        if profile is None:
+            adopter = self._adopters_by_id.get(adopter_id)
+            if adopter is None:
+                return None
+            profile = self._adopter_profiles[adopter_id] = self._build_adopter_profile(adopter)
+        return profile
+    
+    def get_all_animals(self) -> Tuple[Dict[str, Any], ...]:
         """Return all animals"""
         return self.animals
     
-    def get_all_adopters(self) -> List[Dict[str, Any]]:
+    def get_all_adopters(self) -> Tuple[Dict[str, Any], ...]:
         """Return all adopters"""
         return self.adopters
     
+    def _build_animal_profile(self, animal: Dict) -> Dict[str, Any]:
+        """Parse an animal row into a structured profile"""
+        traits = [t.strip() for t in animal.get('behavioral_traits', '').split(';') if t]
+        profile = {
+            "type": "animal",
+            "id": animal.get('animal_id'),
+            "name": animal.get('name'),
+            "species": animal.get('species'),
+            "breed": animal.get('breed'),
+            "age_years": int(animal.get('age_years', 0)),
+            "energy_level": animal.get('energy_level'),
+            "good_with_kids": animal.get('good_with_kids').lower() == 'yes',
+            "good_with_dogs": animal.get('good_with_dogs').lower() == 'yes',
+            "special_needs": animal.get('special_needs').lower() == 'yes',
+            # frozensets so trait/preference checks are O(1) membership tests
+            "behavioral_traits": frozenset(traits),
+            "raw_data": animal
+        }
+        
+        # Create summary
+        traits_text = ', '.join(traits)
+        profile['summary'] = ''.join((
+            profile['name'], ", a ", str(profile['age_years']), "-year-old ",
+            profile['breed'], " with ", profile['energy_level'],
+            " energy. Traits: ", traits_text,
+            ". Good with kids: ", str(profile['good_with_kids']),
+            ", Good with dogs: ", str(profile['good_with_dogs'])
+        ))
+        return profile
+    
+    def _build_adopter_profile(self, adopter: Dict) -> Dict[str, Any]:
+        """Parse an adopter row into a structured profile"""
+        profile = {
+            "type": "adopter",
+            "id": adopter.get('adopter_id'),
+            "name": adopter.get('name'),
+            "home_type": adopter.get('home_type'),
+            "has_kids": adopter.get('has_kids').lower() == 'yes',
+            "has_other_pets": adopter.get('has_other_pets').lower() == 'yes',
+            "lifestyle": adopter.get('lifestyle'),
+            "commitment_level": adopter.get('commitment_level'),
+            "experience_level": adopter.get('experience_level'),
+            "preferences": frozenset(
+                p.strip() for p in adopter.get('preferences', '').split(';') if p
+            ),
+            "raw_data": adopter
+        }
+        
+        # Create summary
+        profile['summary'] = ''.join((
+            profile['name'], ", living in a ", profile['home_type'],
+            " with ", profile['lifestyle'], " lifestyle. Experience: ",
+            profile['experience_level'], ", Commitment: ",
+            profile['commitment_level']
+        ))
+        return profile
+    
     def format_animal_for_agent(self, animal: Dict) -> str:
         """
         Format animal data as readable text for agent
         The agent will read this formatted text
         """
+        animal_id = animal.get('animal_id')
+        # Cached text only describes the loaded row, not other dicts
+        # carrying the same ID
+        if self._animals_by_id.get(animal_id) is animal:
+            return self._animal_texts[animal_id]
+        return self._build_animal_agent_text(animal)
+    
+    def format_adopter_for_agent(self, adopter: Dict) -> str:
+        """
+        Format adopter data as readable text for agent
+        The agent will read this formatted text
+        """
+        adopter_id = adopter.get('adopter_id')
+        if self._adopters_by_id.get(adopter_id) is adopter:
+            return self._adopter_texts[adopter_id]
+        return self._build_adopter_agent_text(adopter)
+    
+    @staticmethod
+    def _build_animal_agent_text(animal: Dict) -> str:
+        """Render an animal row as agent text (cached for loaded rows)"""
         return f"""
 Animal: {animal.get('name', 'Unknown')} (ID: {animal.get('animal_id')})
 Species: {animal.get('species')}
@@ -74,11 +243,9 @@ Special Needs: {animal.get('special_needs')}
 Traits: {animal.get('behavioral_traits')}
 """
     
-    def format_adopter_for_agent(self, adopter: Dict) -> str:
-        """
-        Format adopter data as readable text for agent
-        The agent will read this formatted text
-        """
+    @staticmethod
+    def _build_adopter_agent_text(adopter: Dict) -> str:
+        """Render an adopter row as agent text (cached for loaded rows)"""
         return f"""
 Adopter: {adopter.get('name', 'Unknown')} (ID: {adopter.get('adopter_id')})
 Home Type: {adopter.get('home_type')}
@@ -0,0 +1,118 @@
+"""
+HyperLogLog distinct-value counter
+
+Estimates how many distinct values have been added using a fixed number
+of one-byte registers (2**p), however many values go in. With p=12 the
+state is 4 KiB and the typical error is about 1.6%; small counts fall back
+to linear counting and come out exact in practice.
+
+DistinctCounter keeps an exact set until it grows past a cutoff and only
+then switches to the sketch.
+"""
+
+import math
+from hashlib import blake2b
+from typing import Iterable, List, Optional
+
+
+class HyperLogLog:
+    """Streaming cardinality estimate over byte strings"""
+
+    def __init__(self, p: int = 12, registers: bytes = None):
+        """
+        Args:
+            p: Precision; the sketch keeps 2**p registers
+            registers: State from to_bytes() to resume from
+        """
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(registers) if registers else bytearray(self.m)
+        if len(self.registers) != self.m:
+            raise ValueError(f"Expected {self.m} registers, got {len(self.registers)}")
+        self._alpha = 0.7213 / (1 + 1.079 / self.m)
+        # Running terms of the estimate, kept current by update() so
+        # count() doesn't rescan the registers
+        self._inverse_sum = math.fsum(2.0 ** -r for r in self.registers)
+        self._zeros = self.registers.count(0)
+
+    def update(self, value: bytes):
+        """Add one value"""
+        x = int.from_bytes(blake2b(value, digest_size=8).digest(), 'big')
+        # Top p bits pick the register; the rest give the rank (position
+        # of the leftmost 1 bit)
+        bits = 64 - self.p
+        index = x >> bits
+        rank = bits - (x & ((1 << bits) - 1)).bit_length() + 1
+        old = self.registers[index]
+        if rank > old:
+            self.registers[index] = rank
+            self._inverse_sum += 2.0 ** -rank - 2.0 ** -old
+            if old == 0:
+                self._zeros -= 1
+
+    def count(self) -> float:
+        """Estimated number of distinct values added"""
+        m = self.m
+        estimate = self._alpha * m * m / self._inverse_sum
+        zeros = self._zeros
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction
+            estimate = m * math.log(m / zeros)
+        return estimate
+
+    def to_bytes(self) -> bytes:
+        """Register state, for persisting and passing back to __init__"""
+        return bytes(self.registers)
+
+
+class DistinctCounter:
+    """
+    Distinct-value count that is exact up to `cutoff` values
+
+    Below the cutoff the values are kept in a set; past it they are folded
+    into a HyperLogLog and the count becomes an estimate with fixed memory.
+    """
+
+    def __init__(self, cutoff: int = 10_000, p: int = 12):
+        self.cutoff = cutoff
+        self.p = p
+        self.exact: Optional[set] = set()
+        self.sketch: Optional[HyperLogLog] = None
+
+    @classmethod
+    def from_values(cls, values: Iterable[bytes], **kwargs) -> 'DistinctCounter':
+        """Counter pre-filled with the given values"""
+        counter = cls(**kwargs)
+        for value in values:
+            counter.add(value)
+        return counter
+
+    @classmethod
+    def from_sketch(cls, sketch: HyperLogLog, **kwargs) -> 'DistinctCounter':
+        """Counter already past the cutoff, resuming from a sketch"""
+        counter = cls(p=sketch.p, **kwargs)
+        counter.exact = None
+        counter.sketch = sketch
+        return counter
+
+    def add(self, value: bytes):
+        """Add one value"""
+        if self.exact is None:
+            self.sketch.update(value)
+            return
+        self.exact.add(value)
+        if len(self.exact) > self.cutoff:
+            self.sketch = HyperLogLog(self.p)
+            for seen in self.exact:
+                self.sketch.update(seen)
+            self.exact = None
+
+    def count(self) -> int:
+        """Number of distinct values added (estimated past the cutoff)"""
+        if self.exact is not None:
+            return len(self.exact)
+        return round(self.sketch.count())
+
+    def exact_values(self) -> Optional[List[bytes]]:
+        """The distinct values while still exact, otherwise None"""
+        return None if self.exact is None else list(self.exact)